@@ -1,28 +1,157 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import random
 from server.py.game import Game, Player
 
 
+BOARD_SIZE = 10
+ROW_NAMES = 'ABCDEFGHIJ'
+
+# name and length of the ships each player has to place (in this order)
+FLEET = [('carrier', 5), ('battleship', 4), ('cruiser', 3), ('submarine', 3), ('destroyer', 2)]
+
+
+def fleet_ship_name(idx: int) -> Optional[str]:
+    """ Name of the ship to place at the given position in FLEET, None once all ships are placed """
+    return FLEET[idx][0] if idx < len(FLEET) else None
+
+
+def next_fleet_ship_idx(placed: List[str]) -> int:
+    """ Position in FLEET of the first ship not in the list of placed ship names, len(FLEET) once all are placed """
+    return next((idx for idx, (name, _) in enumerate(FLEET) if name not in placed), len(FLEET))
+
+
+def coord_to_bit(row: int, col: int) -> int:
+    """ Bitboard bit of a square, bits 0..99 map to A1..J10 """
+    return 1 << (row * BOARD_SIZE + col)
+
+
+FULL_BOARD = (1 << BOARD_SIZE * BOARD_SIZE) - 1 # bitboard with all 100 squares set
+
+# the 100 location names by bit index, every other table shares these string objects
+COORD_STRS = tuple(f'{row_name}{col + 1}' for row_name in ROW_NAMES for col in range(BOARD_SIZE))
+
+# location names by row and column (COORDS[2][4] == 'C5') and the reverse lookup
+COORDS = tuple(COORD_STRS[row * BOARD_SIZE:(row + 1) * BOARD_SIZE] for row in range(BOARD_SIZE))
+COORDS_BY_COL = tuple(COORD_STRS[col::BOARD_SIZE] for col in range(BOARD_SIZE))
+LOC_TO_RC: Dict[str, Tuple[int, int]] = {COORDS[row][col]: (row, col)
+                                         for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)}
+
+# bitboard bit of every location name ('A1' -> 1 << 0, ..., 'J10' -> 1 << 99)
+BIT: Dict[str, int] = {location: coord_to_bit(row, col) for location, (row, col) in LOC_TO_RC.items()}
+
+
+def locations_to_mask(locations: Optional[List[str]]) -> int:
+    """ Bitboard of a list of location names """
+    mask = 0
+    for location in locations or []:
+        mask |= BIT[location]
+    return mask
+
+
+def _build_masks(horizontal: bool) -> Dict[int, List[int]]:
+    """ Ship masks per length and start bit, 0 where the ship would run off the board """
+    masks: Dict[int, List[int]] = {}
+    for length in sorted({length for _, length in FLEET}):
+        masks[length] = [0] * (BOARD_SIZE * BOARD_SIZE)
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if (col if horizontal else row) + length > BOARD_SIZE:
+                    continue
+                mask = 0
+                for i in range(length):
+                    mask |= coord_to_bit(row, col + i) if horizontal else coord_to_bit(row + i, col)
+                masks[length][row * BOARD_SIZE + col] = mask
+    return masks
+
+
+# horizontal = same row letter (e.g. A1,A2), vertical = same column number (e.g. A1,B1)
+HORIZ_MASKS = _build_masks(horizontal=True)
+VERT_MASKS = _build_masks(horizontal=False)
+
+
 class ActionType(str, Enum):
     SET_SHIP = 'set_ship'
     SHOOT = 'shoot'
 
 
+@dataclass(slots=True, frozen=True)
 class BattleshipAction:
+    action_type: ActionType
+    ship_name: Optional[str] # only for set_ship actions
+    location: Tuple[str, ...]
+
+
+def _build_placement_templates() -> Dict[str, List[Tuple[int, BattleshipAction]]]:
+    """ All on-board placements of every ship as (bitmask, action), horizontal ones first """
+    templates: Dict[str, List[Tuple[int, BattleshipAction]]] = {}
+    locations: Dict[int, Tuple[str, ...]] = {} # interned by mask, shared by ships of the same length
+    for name, length in FLEET:
+        templates[name] = []
+        for horizontal, masks in ((True, HORIZ_MASKS), (False, VERT_MASKS)):
+            for bit, mask in enumerate(masks[length]):
+                if mask == 0:
+                    continue
+                if mask not in locations:
+                    row, col = divmod(bit, BOARD_SIZE)
+                    locations[mask] = (COORDS[row][col:col + length] if horizontal
+                                       else COORDS_BY_COL[col][row:row + length])
+                templates[name].append((mask, BattleshipAction(ActionType.SET_SHIP, name, locations[mask])))
+    return templates
+
+
+# precomputed once, get_list_action only filters them and never constructs new actions
+PLACEMENT_TEMPLATES = _build_placement_templates()
+
+# bitmasks of all on-board placements per ship, a SET_SHIP action has to match one of them
+PLACEMENT_MASKS = {name: frozenset(mask for mask, _ in templates) for name, templates in PLACEMENT_TEMPLATES.items()}
 
-    def __init__(self, action_type: ActionType, ship_name: Optional[str], location: List[str]) -> None:
-        self.action_type = action_type
-        self.ship_name = ship_name # only for set_ship actions
-        self.location = location
+# shoot action per bit index, get_list_action picks the ones not yet fired at
+SHOOT_ACTIONS = [BattleshipAction(ActionType.SHOOT, None, (location,)) for location in COORD_STRS]
 
 
+def legal_placements(name_of_ship: str, fleet_mask: int) -> List[BattleshipAction]:
+    """ Placements of the given ship that don't overlap the ships in the fleet mask """
+    return [tpl for mask, tpl in PLACEMENT_TEMPLATES[name_of_ship] if not mask & fleet_mask]
+
+
+def legal_shots(shots_mask: int) -> List[BattleshipAction]:
+    """ Shoot actions for all squares not in the shots mask, in board order """
+    actions = []
+    bits = FULL_BOARD & ~shots_mask
+    while bits:
+        lsb = bits & -bits
+        actions.append(SHOOT_ACTIONS[lsb.bit_length() - 1])
+        bits ^= lsb
+    return actions
+
+
+def random_shot(shots_mask: int) -> Optional[BattleshipAction]:
+    """ Random shoot action for a square not in the shots mask, without building the full action list """
+    free = FULL_BOARD & ~shots_mask
+    if free.bit_count() < 16:
+        # rejection sampling gets slow near the end of the game
+        return random.choice(legal_shots(shots_mask)) if free else None
+    while True:
+        idx = random.getrandbits(7)
+        if idx < BOARD_SIZE * BOARD_SIZE and (free >> idx) & 1:
+            return SHOOT_ACTIONS[idx]
+
+
+@dataclass(slots=True)
 class Ship:
+    name: str
+    length: int
+    location: Optional[List[str]]
+    mask: int = field(init=False, default=0)                     # bitboard of the ship's squares
+    hits_mask: int = field(init=False, default=0, compare=False)  # bitboard of the squares already hit
 
-    def __init__(self, name: str, length: int, location: Optional[List[str]]) -> None:
-        self.name = name
-        self.length = length
-        self.location = location
+    def __post_init__(self) -> None:
+        self.mask = locations_to_mask(self.location)
+
+    def is_sunk(self) -> bool:
+        return self.mask != 0 and self.hits_mask == self.mask
 
 
 class PlayerState:
@@ -32,6 +161,42 @@ class PlayerState:
         self.ships = ships
         self.shots = shots
         self.successful_shots = successful_shots
+        self.fleet_mask = 0      # bitboard of all squares covered by own ships
+        self.fleet_hits_mask = 0 # bitboard of the own squares hit by the opponent
+        self.shots_mask = locations_to_mask(shots) # bitboard of the squares already fired at
+        self.ship_idx_by_bit: Dict[int, int] = {}  # index in ships of the ship covering a square
+        self.next_ship_idx = next_fleet_ship_idx([ship.name for ship in ships]) # position in FLEET of the next ship
+        self.next_ship_name = fleet_ship_name(self.next_ship_idx)
+        for idx, ship in enumerate(ships):
+            self.fleet_mask |= ship.mask
+            self.ship_idx_by_bit.update((BIT[location], idx) for location in ship.location or [])
+
+    def has_all_ships_placed(self) -> bool:
+        return len(self.ships) == len(FLEET)
+
+    def all_ships_sunk(self) -> bool:
+        return self.fleet_mask != 0 and self.fleet_hits_mask == self.fleet_mask
+
+
+class MaskedPlayerState(PlayerState):
+    """ Opponent's player state as seen by the other player, with the ship locations hidden """
+
+    def __init__(self, player: PlayerState, hidden_ships: List[Ship]) -> None: # pylint: disable=super-init-not-called
+        # only the visible fields are set and no reference to the full state is kept,
+        # fleet_mask and ship_idx_by_bit raise AttributeError on the view
+        self.name = player.name
+        self.ships = hidden_ships
+        self.shots = player.shots
+        self.successful_shots = player.successful_shots
+        self.shots_mask = player.shots_mask
+        self.fleet_hits_mask = player.fleet_hits_mask
+        self.next_ship_idx = player.next_ship_idx
+        self.next_ship_name = player.next_ship_name
+
+    def all_ships_sunk(self) -> bool:
+        # a complete fleet is sunk once the number of hit squares equals its total length
+        return (self.has_all_ships_placed()
+                and self.fleet_hits_mask.bit_count() == sum(ship.length for ship in self.ships))
 
 
 class GamePhase(str, Enum):
@@ -42,7 +207,8 @@ class GamePhase(str, Enum):
 
 class BattleshipGameState:
 
-    def __init__(self, idx_player_active: int, phase: GamePhase, winner: Optional[int], players: List[PlayerState]) -> None:
+    def __init__(self, idx_player_active: int, phase: GamePhase, winner: Optional[int],
+                 players: List[PlayerState]) -> None:
         self.idx_player_active = idx_player_active
         self.phase = phase
         self.winner = winner
@@ -51,33 +217,168 @@ class BattleshipGameState:
 
 class Battleship(Game):
 
-    def __init__(self):
+    def __init__(self) -> None:
         """ Game initialization (set_state call not necessary) """
-        pass
+        players = [
+            PlayerState(name='Player 1', ships=[], shots=[], successful_shots=[]),
+            PlayerState(name='Player 2', ships=[], shots=[], successful_shots=[]),
+        ]
+        self.state = BattleshipGameState(idx_player_active=0, phase=GamePhase.SETUP, winner=None, players=players)
+        self._version = 0 # bumped on every state change, invalidates the cached player views
+        # cached views are shared between callers and must be treated as read-only
+        self._view_cache: Dict[int, Tuple[Tuple[int, int, GamePhase, Optional[int]], BattleshipGameState]] = {}
+        self._hidden_ships_cache: Dict[int, List[Ship]] = {} # per player, only changes while ships are placed
+        self._ships_placed = 0 # over both players, the setup phase ends with 2 * len(FLEET)
 
     def print_state(self) -> None:
         """ Set the game to a given state """
-        pass
+        print(f'Phase: {self.state.phase.value}, active player: {self.state.idx_player_active}, '
+              f'winner: {self.state.winner}')
+        for player in self.state.players:
+            print(f'  {player.name}: {len(player.ships)} ship(s), {len(player.shots)} shot(s), '
+                  f'{len(player.successful_shots)} hit(s)')
+            for ship in player.ships:
+                print(f'    {ship.name} ({ship.length}): {ship.location}')
 
     def get_state(self) -> BattleshipGameState:
         """ Get the complete, unmasked game state """
-        pass
+        return self.state
 
     def set_state(self, state: BattleshipGameState) -> None:
         """ Print the current game state """
-        pass
+        self.state = state
+        self._version += 1
+        self._hidden_ships_cache = {}
+        for idx, player in enumerate(state.players):
+            hits_mask = locations_to_mask(state.players[1 - idx].successful_shots)
+            player.fleet_mask = 0
+            player.ship_idx_by_bit = {}
+            for idx_ship, ship in enumerate(player.ships):
+                ship.mask = locations_to_mask(ship.location)
+                ship.hits_mask = ship.mask & hits_mask
+                player.fleet_mask |= ship.mask
+                player.ship_idx_by_bit.update((BIT[location], idx_ship) for location in ship.location or [])
+            player.fleet_hits_mask = player.fleet_mask & hits_mask
+            player.shots_mask = locations_to_mask(player.shots)
+            player.next_ship_idx = next_fleet_ship_idx([ship.name for ship in player.ships])
+            player.next_ship_name = fleet_ship_name(player.next_ship_idx)
+        self._ships_placed = sum(len(player.ships) for player in state.players)
+
+    @staticmethod
+    def generate_ship_coordinates(start: str, length: int, horizontal: bool) -> Optional[List[str]]:
+        """ Names of the squares covered by a ship, None if it doesn't fit on the board """
+        row, col = LOC_TO_RC[start]
+        if (col if horizontal else row) + length > BOARD_SIZE:
+            return None
+        if horizontal:
+            return list(COORDS[row][col:col + length])
+        return list(COORDS_BY_COL[col][row:row + length])
+
+    @staticmethod
+    def is_valid_ship_placement(player: PlayerState, start: str, length: int, horizontal: bool) -> bool:
+        """ True if the ship fits on the board and doesn't overlap the player's other ships """
+        row, col = LOC_TO_RC[start]
+        bit = row * BOARD_SIZE + col
+        mask = HORIZ_MASKS[length][bit] if horizontal else VERT_MASKS[length][bit]
+        return mask != 0 and (mask & player.fleet_mask) == 0
 
     def get_list_action(self) -> List[BattleshipAction]:
         """ Get a list of possible actions for the active player """
-        pass
+        if self.state.phase == GamePhase.FINISHED:
+            return []
+
+        active_player = self.state.players[self.state.idx_player_active]
+
+        if self.state.phase == GamePhase.SETUP:
+            if active_player.next_ship_name is None:
+                return []
+            return legal_placements(active_player.next_ship_name, active_player.fleet_mask)
+
+        return legal_shots(active_player.shots_mask)
 
-    def apply_action(self, action: BattleshipAction) -> None:
+    def random_action(self) -> Optional[BattleshipAction]:
+        """ Random action for the active player, same distribution as choosing from get_list_action """
+        if self.state.phase == GamePhase.RUNNING:
+            return random_shot(self.state.players[self.state.idx_player_active].shots_mask)
+        actions = self.get_list_action()
+        return random.choice(actions) if actions else None
+
+    def apply_action(self, action: Optional[BattleshipAction]) -> None:
         """ Apply the given action to the game """
-        pass
+        if action is None or self.state.phase == GamePhase.FINISHED:
+            return
+
+        idx_active = self.state.idx_player_active
+        active_player = self.state.players[idx_active]
+        opponent = self.state.players[1 - idx_active]
+
+        if action.action_type == ActionType.SET_SHIP:
+            name = action.ship_name
+            if self.state.phase != GamePhase.SETUP or name is None or name not in PLACEMENT_MASKS:
+                return
+            mask = 0
+            for loc in action.location:
+                mask |= BIT.get(loc, 0)
+            if (mask not in PLACEMENT_MASKS[name] or mask & active_player.fleet_mask
+                    or any(placed.name == name for placed in active_player.ships)):
+                # not a placement of this ship on the board, overlapping or the ship is already placed
+                return
+            self._version += 1
+            location = list(action.location)
+            ship = Ship(name=name, length=len(location), location=location)
+            active_player.ship_idx_by_bit.update((BIT[loc], len(active_player.ships)) for loc in location)
+            active_player.ships.append(ship)
+            active_player.fleet_mask |= ship.mask
+            active_player.next_ship_idx = next_fleet_ship_idx([placed.name for placed in active_player.ships])
+            active_player.next_ship_name = fleet_ship_name(active_player.next_ship_idx)
+            self._ships_placed += 1
+            if self._ships_placed >= 2 * len(FLEET):
+                self.state.phase = GamePhase.RUNNING
+
+        elif action.action_type == ActionType.SHOOT:
+            if self.state.phase != GamePhase.RUNNING or len(action.location) != 1:
+                return
+            target = action.location[0]
+            bit = BIT.get(target)
+            if bit is None or bit & active_player.shots_mask:
+                # not a square on the board or already fired at
+                return
+            self._version += 1
+            active_player.shots.append(target)
+            active_player.shots_mask |= bit
+            if bit & opponent.fleet_mask:
+                opponent.ships[opponent.ship_idx_by_bit[bit]].hits_mask |= bit
+                opponent.fleet_hits_mask |= bit
+                active_player.successful_shots.append(target)
+            if opponent.all_ships_sunk():
+                self.state.phase = GamePhase.FINISHED
+                self.state.winner = idx_active
+                return
+
+        self.state.idx_player_active = 1 - idx_active
+
+    def _hidden_ships(self, idx_player: int) -> List[Ship]:
+        """ Ships of the given player with the locations hidden, shared by the views until a ship is added """
+        ships = self.state.players[idx_player].ships
+        hidden = self._hidden_ships_cache.get(idx_player)
+        if hidden is None or len(hidden) != len(ships):
+            hidden = [Ship(name=ship.name, length=ship.length, location=None) for ship in ships]
+            self._hidden_ships_cache[idx_player] = hidden
+        return hidden
 
     def get_player_view(self, idx_player: int) -> BattleshipGameState:
         """ Get the masked state for the active player (e.g. the oppontent's cards are face down)"""
-        pass
+        # the top-level fields are part of the key, callers may set them on the state directly
+        key = (self._version, self.state.idx_player_active, self.state.phase, self.state.winner)
+        cached = self._view_cache.get(idx_player)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        players = [player if idx == idx_player else MaskedPlayerState(player, self._hidden_ships(idx))
+                   for idx, player in enumerate(self.state.players)]
+        view = BattleshipGameState(idx_player_active=self.state.idx_player_active, phase=self.state.phase,
+                                   winner=self.state.winner, players=players)
+        self._view_cache[idx_player] = (key, view)
+        return view
 
 
 class RandomPlayer(Player):
@@ -92,3 +393,6 @@ class RandomPlayer(Player):
 if __name__ == "__main__":
 
     game = Battleship()
+    while game.get_state().phase != GamePhase.FINISHED:
+        game.apply_action(game.random_action())
+    game.print_state()
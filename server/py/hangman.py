@@ -1,15 +1,47 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import random
+import string
 from enum import Enum
 from server.py.game import Game, Player
 
 
+MAX_WRONG_GUESSES = 8
+
+
+# bit of every capital letter in a 26-bit letter mask ('A' -> 1 << 0, ..., 'Z' -> 1 << 25)
+LETTER_BITS: Dict[str, int] = {letter: 1 << idx for idx, letter in enumerate(string.ascii_uppercase)}
+
+
+def letters_to_mask(letters: str) -> int:
+    """ 26-bit mask of the letters A-Z contained in the given string (case insensitive) """
+    mask = 0
+    for letter in set(letters.upper()):
+        mask |= LETTER_BITS.get(letter, 0)
+    return mask
+
+
+def build_mask_table(guessed_mask: int) -> Dict[int, str]:
+    """ str.translate table replacing every letter not in the guessed mask by '_' """
+    table = {}
+    for idx, letter in enumerate(string.ascii_uppercase):
+        guessed = (guessed_mask >> idx) & 1
+        table[ord(letter)] = letter if guessed else '_'
+        table[ord(letter.lower())] = letter.lower() if guessed else '_'
+    return table
+
+
 class GuessLetterAction:
 
     def __init__(self, letter: str) -> None:
         self.letter = letter
 
 
+ALL_LETTERS_MASK = (1 << len(string.ascii_uppercase)) - 1
+
+# one shared action per letter A..Z, get_list_action only picks the ones not guessed yet
+GUESS_ACTIONS = tuple(GuessLetterAction(letter) for letter in string.ascii_uppercase)
+
+
 class GamePhase(str, Enum):
     SETUP = 'setup'            # before the game has started
     RUNNING = 'running'        # while the game is running
@@ -29,31 +61,67 @@ class Hangman(Game):
 
     def __init__(self) -> None:
         """ Important: Game initialization also requires a set_state call to set the 'word_to_guess' """
-        pass
+        self.state = HangmanGameState(word_to_guess='', phase=GamePhase.SETUP, guesses=[], incorrect_guesses=[])
+        self.word_mask = 0    # letters contained in the word to guess
+        self.guessed_mask = 0 # letters guessed so far
+        self._mask_table: Dict[int, str] = {}
+        self._mask_table_guessed = -1 # guessed mask the translate table was built for
 
     def get_state(self) -> HangmanGameState:
         """ Set the game to a given state """
-        pass
+        return self.state
 
     def set_state(self, state: HangmanGameState) -> None:
         """ Get the complete, unmasked game state """
-        pass
+        self.state = state
+        self.word_mask = letters_to_mask(state.word_to_guess)
+        self.guessed_mask = letters_to_mask(''.join(state.guesses))
+
+    def masked_word(self) -> str:
+        """ The word to guess with all letters not guessed yet replaced by '_' """
+        if self._mask_table_guessed != self.guessed_mask:
+            self._mask_table = build_mask_table(self.guessed_mask)
+            self._mask_table_guessed = self.guessed_mask
+        return self.state.word_to_guess.translate(self._mask_table)
 
     def print_state(self) -> None:
         """ Print the current game state """
-        pass
+        print(f'Word: {self.masked_word()}, phase: {self.state.phase.value}, '
+              f'guesses: {self.state.guesses}, incorrect guesses: {self.state.incorrect_guesses}')
 
     def get_list_action(self) -> List[GuessLetterAction]:
         """ Get a list of possible actions for the active player """
-        pass
+        if self.state.phase == GamePhase.FINISHED:
+            return []
+        available_mask = ALL_LETTERS_MASK & ~self.guessed_mask
+        return [GUESS_ACTIONS[idx] for idx in range(len(GUESS_ACTIONS)) if (available_mask >> idx) & 1]
 
     def apply_action(self, action: GuessLetterAction) -> None:
         """ Apply the given action to the game """
-        pass
-
-    def get_player_view(self, idx_player: int) -> HangmanGameState:
+        if action is None or self.state.phase == GamePhase.FINISHED:
+            return
+
+        guessed_letter = action.letter.upper()
+        bit = LETTER_BITS.get(guessed_letter)
+        if bit is None or bit & self.guessed_mask:
+            # not a letter A-Z or already guessed
+            return
+        self.state.guesses.append(guessed_letter)
+        self.guessed_mask |= bit
+        self.state.phase = GamePhase.RUNNING # the first accepted guess starts the game
+        if not bit & self.word_mask:
+            self.state.incorrect_guesses.append(guessed_letter)
+
+        wrong_guesses = (self.guessed_mask & ~self.word_mask).bit_count()
+        if self.guessed_mask & self.word_mask == self.word_mask or wrong_guesses >= MAX_WRONG_GUESSES:
+            self.state.phase = GamePhase.FINISHED
+
+    def get_player_view(self, idx_player: int) -> HangmanGameState: # pylint: disable=unused-argument
         """ Get the masked state for the active player (e.g. the oppontent's cards are face down)"""
-        pass
+        if self.state.phase == GamePhase.FINISHED:
+            return self.state
+        return HangmanGameState(word_to_guess=self.masked_word(), phase=self.state.phase,
+                                guesses=self.state.guesses, incorrect_guesses=self.state.incorrect_guesses)
 
 
 class RandomPlayer(Player):
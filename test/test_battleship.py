@@ -0,0 +1,319 @@
+from typing import List
+from server.py.battleship import (Battleship, BattleshipGameState, PlayerState, Ship, BattleshipAction, ActionType,
+                                  GamePhase, RandomPlayer, FLEET, BIT, FULL_BOARD, legal_placements,
+                                  random_shot)
+
+
+def make_fleet() -> List[Ship]:
+    return [
+        Ship(name='carrier', length=5, location=['A1', 'A2', 'A3', 'A4', 'A5']),
+        Ship(name='battleship', length=4, location=['B1', 'B2', 'B3', 'B4']),
+        Ship(name='cruiser', length=3, location=['C1', 'C2', 'C3']),
+        Ship(name='submarine', length=3, location=['D1', 'D2', 'D3']),
+        Ship(name='destroyer', length=2, location=['E1', 'E2']),
+    ]
+
+
+def running_game(successful_shots: List[str]) -> Battleship:
+    """ Game in the shooting phase where player 1 has already hit the given squares of player 2 """
+    player0 = PlayerState(name='Player 1', ships=make_fleet(), shots=list(successful_shots),
+                          successful_shots=list(successful_shots))
+    player1 = PlayerState(name='Player 2', ships=make_fleet(), shots=[], successful_shots=[])
+    game = Battleship()
+    game.set_state(BattleshipGameState(idx_player_active=0, phase=GamePhase.RUNNING, winner=None,
+                                       players=[player0, player1]))
+    return game
+
+
+def play_setup(game: Battleship) -> None:
+    player = RandomPlayer()
+    for _ in range(2 * len(FLEET)):
+        game.apply_action(player.select_action(game.get_state(), game.get_list_action()))
+
+
+def test_initial_state() -> None:
+    state = Battleship().get_state()
+    assert state.phase == GamePhase.SETUP
+    assert state.idx_player_active == 0
+    assert [player.ships for player in state.players] == [[], []]
+
+
+def test_placement_actions_fit_on_board() -> None:
+    actions = Battleship().get_list_action()
+    assert all(action.action_type == ActionType.SET_SHIP and action.ship_name == 'carrier' for action in actions)
+    # 6 horizontal and 6 vertical start squares per row/column for a ship of length 5
+    assert len(actions) == 2 * 6 * 10
+    assert ('A6', 'A7', 'A8', 'A9', 'A10') in {action.location for action in actions}
+    assert all(len(action.location) == 5 for action in actions)
+
+
+def test_placement_actions_do_not_overlap() -> None:
+    game = Battleship()
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('C1', 'C2', 'C3', 'C4', 'C5')))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('J1', 'J2', 'J3', 'J4', 'J5')))
+    actions = game.get_list_action()
+    assert all(action.ship_name == 'battleship' for action in actions)
+    assert not any(set(action.location) & {'C1', 'C2', 'C3', 'C4', 'C5'} for action in actions)
+    assert ('B1', 'B2', 'B3', 'B4') in {action.location for action in actions}
+
+
+def test_legal_placements_against_fleet_mask() -> None:
+    fleet_mask = BIT['A1'] | BIT['B1']
+    locations = {action.location for action in legal_placements('destroyer', fleet_mask)}
+    assert ('A1', 'A2') not in locations
+    assert ('A1', 'B1') not in locations
+    assert ('A2', 'A3') in locations
+    assert ('J9', 'J10') in locations
+
+
+def test_is_valid_ship_placement() -> None:
+    carrier = Ship(name='carrier', length=5, location=['C1', 'C2', 'C3', 'C4', 'C5'])
+    player = PlayerState(name='Player 1', ships=[carrier], shots=[], successful_shots=[])
+    assert Battleship.is_valid_ship_placement(player, 'A1', 3, horizontal=True)
+    assert not Battleship.is_valid_ship_placement(player, 'A1', 3, horizontal=False)
+    assert not Battleship.is_valid_ship_placement(player, 'A9', 3, horizontal=True)
+    assert not Battleship.is_valid_ship_placement(player, 'I1', 3, horizontal=False)
+    assert Battleship.generate_ship_coordinates('A1', 3, horizontal=False) == ['A1', 'B1', 'C1']
+    assert Battleship.generate_ship_coordinates('A9', 3, horizontal=True) is None
+
+
+def test_setup_switches_to_running_after_all_ships() -> None:
+    game = Battleship()
+    play_setup(game)
+    state = game.get_state()
+    assert state.phase == GamePhase.RUNNING
+    for player in state.players:
+        assert sorted(ship.length for ship in player.ships) == [2, 3, 3, 4, 5]
+        locations = [location for ship in player.ships for location in ship.location or []]
+        assert len(locations) == len(set(locations)) == 17
+    actions = game.get_list_action()
+    assert len(actions) == 100
+    assert all(action.action_type == ActionType.SHOOT and action.ship_name is None for action in actions)
+
+
+def test_setup_ends_after_set_state_with_last_ship_missing() -> None:
+    players = [PlayerState(name='Player 1', ships=make_fleet(), shots=[], successful_shots=[]),
+               PlayerState(name='Player 2', ships=make_fleet()[:-1], shots=[], successful_shots=[])]
+    game = Battleship()
+    game.set_state(BattleshipGameState(idx_player_active=1, phase=GamePhase.SETUP, winner=None, players=players))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'destroyer', ('J1', 'J2')))
+    assert game.get_state().phase == GamePhase.RUNNING
+
+
+def test_invalid_placements_are_ignored() -> None:
+    game = Battleship()
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('A1',)))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('A1', 'A2', 'A3', 'A4', 'A5')))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('J1', 'J2', 'J3', 'J4', 'J5')))
+    invalid = [
+        ('carrier', ('A1', 'B1', 'C1', 'D1', 'E1')),     # already placed and overlapping
+        ('carrier', ('F1', 'F2', 'F3', 'F4', 'F5')),     # already placed
+        ('battleship', ('A4', 'B4', 'C4', 'D4')),        # overlapping
+        ('battleship', ('B1', 'B2', 'B3')),              # wrong length
+        ('battleship', ('B1', 'B3', 'B5', 'B7')),        # not contiguous
+        ('battleship', ('B8', 'B9', 'B10', 'B11')),      # off the board
+        ('battleship', ('b1', 'b2', 'b3', 'b4')),        # not a location name
+        ('battleship', ('B1', 'B1', 'B2', 'B3')),        # repeated square
+        ('frigate', ('B1', 'B2')),                       # not in the fleet
+        (None, ('B1', 'B2', 'B3', 'B4')),
+    ]
+    for name, location in invalid:
+        game.apply_action(BattleshipAction(ActionType.SET_SHIP, name, location))
+    state = game.get_state()
+    player = state.players[0]
+    assert state.idx_player_active == 0
+    assert [ship.name for ship in player.ships] == ['carrier']
+    assert player.shots == [] and player.next_ship_name == 'battleship'
+    assert player.ship_idx_by_bit[BIT['A1']] == 0
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'battleship', ('B1', 'B2', 'B3', 'B4')))
+    assert state.idx_player_active == 1
+
+
+def test_ships_placed_out_of_order() -> None:
+    game = Battleship()
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'submarine', ('C5', 'D5', 'E5')))
+    player = game.get_state().players[0]
+    assert player.next_ship_name == 'carrier'
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('J1', 'J2', 'J3', 'J4', 'J5')))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('A1', 'A2', 'A3', 'A4', 'A5')))
+    assert player.next_ship_name == 'battleship'
+    while game.get_state().phase == GamePhase.SETUP:
+        game.apply_action(game.random_action())
+    assert game.get_state().phase == GamePhase.RUNNING
+    assert sorted(ship.name for ship in player.ships) == sorted(name for name, _ in FLEET)
+
+
+def test_invalid_shots_are_ignored() -> None:
+    game = running_game([])
+    for location in (('K1',), ('a1',), ('A11',), (), ('A1', 'A2')):
+        game.apply_action(BattleshipAction(ActionType.SHOOT, None, location))
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'destroyer', ('J1', 'J2')))
+    state = game.get_state()
+    assert state.idx_player_active == 0
+    assert state.players[0].shots == []
+    assert len(state.players[0].ships) == len(FLEET)
+
+
+def test_shot_hit_and_miss() -> None:
+    game = running_game([])
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('A1',)))
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('J10',)))
+    state = game.get_state()
+    assert state.players[0].shots == ['A1'] and state.players[0].successful_shots == ['A1']
+    assert state.players[1].shots == ['J10'] and state.players[1].successful_shots == []
+    assert state.idx_player_active == 0
+    assert len(game.get_list_action()) == 99
+
+
+def test_repeated_shot_is_ignored() -> None:
+    game = running_game(['A1'])
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('A1',)))
+    state = game.get_state()
+    assert state.players[0].shots == ['A1']
+    assert state.players[0].successful_shots == ['A1']
+    assert state.idx_player_active == 0
+
+
+def test_ship_sunk_after_set_state() -> None:
+    game = running_game(['E1', 'A1'])
+    ships = {ship.name: ship for ship in game.get_state().players[1].ships}
+    assert not ships['destroyer'].is_sunk()
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('E2',)))
+    assert ships['destroyer'].is_sunk()
+    assert not ships['carrier'].is_sunk()
+    assert game.get_state().phase == GamePhase.RUNNING
+
+
+def test_unplaced_ships_are_not_sunk() -> None:
+    assert not Ship(name='carrier', length=5, location=None).is_sunk()
+    assert not PlayerState(name='Player 1', ships=[], shots=[], successful_shots=[]).all_ships_sunk()
+    game = Battleship()
+    play_setup(game)
+    assert not any(ship.is_sunk() for ship in game.get_player_view(0).players[1].ships)
+
+
+def test_last_hit_wins() -> None:
+    all_squares = [location for ship in make_fleet() for location in ship.location or []]
+    game = running_game(all_squares[:-1])
+    assert not game.get_state().players[1].all_ships_sunk()
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, (all_squares[-1],)))
+    state = game.get_state()
+    assert state.phase == GamePhase.FINISHED
+    assert state.winner == 0
+    assert game.get_list_action() == []
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('J10',)))
+    assert 'J10' not in state.players[0].shots
+
+
+def test_player_view_hides_opponent_ships() -> None:
+    game = Battleship()
+    play_setup(game)
+    view = game.get_player_view(0)
+    assert all(ship.location is not None for ship in view.players[0].ships)
+    assert [ship.location for ship in view.players[1].ships] == [None] * len(FLEET)
+    assert [ship.name for ship in view.players[1].ships] == [name for name, _ in FLEET]
+
+
+def test_player_view_does_not_reveal_ship_positions() -> None:
+    game = Battleship()
+    play_setup(game)
+    real = game.get_state().players[1]
+    masked = game.get_player_view(0).players[1]
+    ship_locations = {location for ship in real.ships for location in ship.location or []}
+    ship_bits = {BIT[location] for location in ship_locations}
+    for name in vars(real):
+        if name in ('name', 'shots', 'successful_shots', 'shots_mask', 'fleet_hits_mask', 'next_ship_idx',
+                    'next_ship_name'):
+            continue
+        value = getattr(masked, name, None)
+        if isinstance(value, int):
+            assert not value & real.fleet_mask, name
+        elif isinstance(value, dict):
+            assert not ship_bits & set(value), name
+        elif isinstance(value, list):
+            assert all(ship.location is None for ship in value), name
+    assert not hasattr(masked, 'ship_idx_by_bit')
+
+
+def test_player_view_keeps_only_visible_fields() -> None:
+    game = Battleship()
+    play_setup(game)
+    masked = game.get_player_view(0).players[1]
+    assert set(vars(masked)) == {'name', 'ships', 'shots', 'successful_shots', 'shots_mask', 'fleet_hits_mask',
+                                 'next_ship_idx', 'next_ship_name'}
+    assert masked.next_ship_name is None
+    assert not masked.all_ships_sunk()
+
+
+def test_player_view_reuses_hidden_ships() -> None:
+    game = Battleship()
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('A1', 'A2', 'A3', 'A4', 'A5')))
+    hidden = game.get_player_view(1).players[0].ships
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'carrier', ('J1', 'J2', 'J3', 'J4', 'J5')))
+    view = game.get_player_view(1)
+    assert view.players[0].ships is hidden
+    assert view.players[0].next_ship_name == 'battleship'
+    game.apply_action(BattleshipAction(ActionType.SET_SHIP, 'battleship', ('B1', 'B2', 'B3', 'B4')))
+    assert [ship.name for ship in game.get_player_view(1).players[0].ships] == ['carrier', 'battleship']
+    play_setup(game)
+    hidden = game.get_player_view(0).players[1].ships
+    game.apply_action(game.random_action())
+    assert game.get_player_view(0).players[1].ships is hidden
+
+
+def test_player_view_reports_sunk_fleet() -> None:
+    all_squares = [location for ship in make_fleet() for location in ship.location or []]
+    game = running_game(all_squares[:-1])
+    assert not game.get_player_view(0).players[1].all_ships_sunk()
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, (all_squares[-1],)))
+    assert game.get_player_view(0).players[1].all_ships_sunk()
+
+
+def test_player_view_is_cached_per_state() -> None:
+    game = running_game([])
+    view = game.get_player_view(0)
+    assert game.get_player_view(0) is view
+    game.get_state().idx_player_active = 1
+    assert game.get_player_view(0).idx_player_active == 1
+    game.apply_action(BattleshipAction(ActionType.SHOOT, None, ('A1',)))
+    assert game.get_player_view(0).players[1].shots == ['A1']
+
+
+def test_random_self_play_finishes() -> None:
+    game = Battleship()
+    player = RandomPlayer()
+    while game.get_state().phase != GamePhase.FINISHED:
+        game.apply_action(player.select_action(game.get_player_view(game.get_state().idx_player_active),
+                                               game.get_list_action()))
+    state = game.get_state()
+    assert state.winner is not None
+    assert len(state.players[state.winner].successful_shots) == 17
+    assert player.select_action(state, []) is None
+
+
+def test_random_shot_picks_free_squares() -> None:
+    shots_mask = FULL_BOARD & ~(BIT['A1'] | BIT['J10'])
+    # few free squares left, sampled from the list of legal shots
+    actions = [random_shot(shots_mask) for _ in range(50)]
+    assert {action.location for action in actions if action is not None} == {('A1',), ('J10',)}
+    assert random_shot(FULL_BOARD) is None
+    # many free squares left, sampled by rejection
+    shots_mask = BIT['A1'] | BIT['B2']
+    for _ in range(200):
+        action = random_shot(shots_mask)
+        assert action is not None and action.action_type == ActionType.SHOOT
+        assert not BIT[action.location[0]] & shots_mask
+
+
+def test_random_action_plays_full_game() -> None:
+    game = Battleship()
+    while game.get_state().phase != GamePhase.FINISHED:
+        action = game.random_action()
+        assert action is not None
+        game.apply_action(action)
+    state = game.get_state()
+    for player in state.players:
+        assert len(set(player.shots)) == len(player.shots)
+    assert state.winner is not None
+    assert len(state.players[state.winner].successful_shots) == 17
+    assert game.random_action() is None
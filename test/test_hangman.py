@@ -0,0 +1,94 @@
+import string
+from server.py.hangman import Hangman, HangmanGameState, GamePhase, GuessLetterAction, RandomPlayer
+
+
+def running_game(word_to_guess: str, guesses: str = '') -> Hangman:
+    game = Hangman()
+    game.set_state(HangmanGameState(word_to_guess=word_to_guess, phase=GamePhase.RUNNING,
+                                    guesses=list(guesses), incorrect_guesses=[]))
+    return game
+
+
+def test_action_list_after_set_state() -> None:
+    game = running_game('DevOps', 'ACE')
+    letters = [action.letter for action in game.get_list_action()]
+    assert letters == [letter for letter in string.ascii_uppercase if letter not in 'ACE']
+    game = running_game('DevOps', string.ascii_uppercase)
+    assert game.get_list_action() == []
+
+
+def test_guess_updates_state() -> None:
+    game = running_game('DevOps')
+    game.apply_action(GuessLetterAction('d'))
+    game.apply_action(GuessLetterAction('x'))
+    game.apply_action(GuessLetterAction('D'))
+    state = game.get_state()
+    assert state.guesses == ['D', 'X']
+    assert state.incorrect_guesses == ['X']
+    assert 'D' not in [action.letter for action in game.get_list_action()]
+
+
+def test_invalid_guesses_are_ignored() -> None:
+    game = running_game('DevOps')
+    for letter in ('1', '', 'AB', 'Ä', '_'):
+        game.apply_action(GuessLetterAction(letter))
+    game.apply_action(None)
+    state = game.get_state()
+    assert state.guesses == []
+    assert state.phase == GamePhase.RUNNING
+
+
+def test_first_guess_starts_game() -> None:
+    game = Hangman()
+    game.set_state(HangmanGameState(word_to_guess='DevOps', phase=GamePhase.SETUP, guesses=[], incorrect_guesses=[]))
+    game.apply_action(GuessLetterAction('1'))
+    assert game.get_state().phase == GamePhase.SETUP
+    game.apply_action(GuessLetterAction('x'))
+    assert game.get_state().phase == GamePhase.RUNNING
+    assert game.get_player_view(0).phase == GamePhase.RUNNING
+
+
+def test_win_with_mixed_case_word() -> None:
+    game = running_game('DevOps', 'DEVOP')
+    assert game.get_state().phase == GamePhase.RUNNING
+    game.apply_action(GuessLetterAction('s'))
+    assert game.get_state().phase == GamePhase.FINISHED
+    assert game.get_list_action() == []
+    game.apply_action(GuessLetterAction('Z'))
+    assert 'Z' not in game.get_state().guesses
+
+
+def test_loss_after_max_wrong_guesses() -> None:
+    game = running_game('XY', 'ABCDEFX')
+    game.apply_action(GuessLetterAction('G'))
+    assert game.get_state().phase == GamePhase.RUNNING
+    game.apply_action(GuessLetterAction('H'))
+    assert game.get_state().phase == GamePhase.FINISHED
+
+
+def test_masked_word() -> None:
+    game = running_game('Dev-Ops 2', 'OD')
+    assert game.masked_word() == 'D__-O__ 2'
+    game.apply_action(GuessLetterAction('s'))
+    assert game.masked_word() == 'D__-O_s 2'
+    game.set_state(HangmanGameState(word_to_guess='Dev-Ops 2', phase=GamePhase.RUNNING,
+                                    guesses=['E'], incorrect_guesses=[]))
+    assert game.masked_word() == '_e_-___ 2'
+
+
+def test_player_view_masks_word_until_finished() -> None:
+    game = running_game('DevOps', 'VO')
+    view = game.get_player_view(0)
+    assert view.word_to_guess == '__vO__'
+    assert view.guesses == ['V', 'O']
+    for letter in 'DEPS':
+        game.apply_action(GuessLetterAction(letter))
+    assert game.get_player_view(0).word_to_guess == 'DevOps'
+
+
+def test_random_player() -> None:
+    game = running_game('DevOps')
+    player = RandomPlayer()
+    while game.get_state().phase != GamePhase.FINISHED:
+        game.apply_action(player.select_action(game.get_player_view(0), game.get_list_action()))
+    assert player.select_action(game.get_state(), []) is None